@@ -2,10 +2,12 @@ from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date
+import asyncio
 import uvicorn
 
-from main import process_search, process_single_url
+from main import process_search, process_single_url, enable_micro_batching
 from src.extraction.schema import FOARecord
+from config.settings import API_WORKERS
 
 app = FastAPI(
     title="FOA Intelligence API",
@@ -13,6 +15,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Batch embedding encodes across concurrent requests
+enable_micro_batching()
+
 # ──────────────────────────────────────────────────────────────
 # Models
 # ──────────────────────────────────────────────────────────────
@@ -43,7 +48,8 @@ async def search_foas(
 ):
     """Search for funding opportunities across supported sources."""
     try:
-        records = process_search(
+        records = await asyncio.to_thread(
+            process_search,
             keyword=q,
             source=source,
             max_results=limit,
@@ -60,10 +66,12 @@ async def ingest_url(
 ):
     """Ingest and analyze a single FOA by URL."""
     try:
-        record = process_single_url(url, use_embeddings=use_embeddings)
+        record = await asyncio.to_thread(
+            process_single_url, url, use_embeddings=use_embeddings
+        )
         return record
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, workers=API_WORKERS)
@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
 import json
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 import plotly.express as px
 
 # Import pipeline components
-from main import process_search, process_single_url
+from main import process_search, process_single_url, load_taggers
 from config.settings import DEFAULT_OUTPUT_DIR
 
 # ──────────────────────────────────────────────────────────────
@@ -50,6 +51,50 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ──────────────────────────────────────────────────────────────
+# Cached Pipeline Calls (persist across Streamlit reruns)
+# ──────────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner="Loading tagging models...")
+def get_taggers(use_embeddings: bool):
+    """Load the ontology and taggers once per server process."""
+    return load_taggers(use_embeddings=use_embeddings)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_search(query: str, source: str, max_results: int, use_embeddings: bool):
+    get_taggers(use_embeddings)
+    return process_search(
+        keyword=query,
+        source=source,
+        max_results=max_results,
+        use_embeddings=use_embeddings
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_ingest(url: str, use_embeddings: bool):
+    get_taggers(use_embeddings)
+    return process_single_url(url, use_embeddings=use_embeddings)
+
+
+@st.cache_data(show_spinner=False)
+def compute_distributions(_records, records_key: tuple):
+    """
+    Tag and agency count tables, cached per result set. records_key
+    identifies the records (ID and ingestion time of each), so they are
+    never hashed in full and a refreshed search gets fresh tables.
+    """
+    tag_counter = Counter(
+        t.short for r in _records for t in r.semantic_tags
+    )
+    tag_df = None
+    if tag_counter:
+        tag_df = pd.DataFrame(tag_counter.most_common(), columns=['Tag', 'Count'])
+
+    agency_counter = Counter(r.agency for r in _records)
+    agency_df = pd.DataFrame(agency_counter.most_common(), columns=['Agency', 'Count'])
+    return tag_df, agency_df
+
 # ──────────────────────────────────────────────────────────────
 # Sidebar
 # ──────────────────────────────────────────────────────────────
@@ -90,12 +135,7 @@ with tab1:
     if search_btn and query:
         with st.spinner(f"Searching {source} for '{query}'..."):
             try:
-                records = process_search(
-                    keyword=query,
-                    source=source,
-                    max_results=max_results,
-                    use_embeddings=use_embeddings
-                )
+                records = cached_search(query, source, max_results, use_embeddings)
                 st.session_state['records'] = records
             except Exception as e:
                 st.error(f"Search failed: {e}")
@@ -108,7 +148,7 @@ with tab2:
     if ingest_btn and url_input:
         with st.spinner("Analyzing opportunity..."):
             try:
-                record = process_single_url(url_input, use_embeddings=use_embeddings)
+                record = cached_ingest(url_input, use_embeddings)
                 st.session_state['records'] = [record]
             except Exception as e:
                 st.error(f"Analysis failed: {e}")
@@ -118,6 +158,9 @@ with tab2:
 # ──────────────────────────────────────────────────────────────
 if 'records' in st.session_state and st.session_state['records']:
     records = st.session_state['records']
+    tag_df, agency_df = compute_distributions(
+        records, tuple((r.foa_id, r.ingested_at) for r in records)
+    )
     
     # Summary Metrics
     m1, m2, m3, m4 = st.columns(4)
@@ -139,13 +182,7 @@ if 'records' in st.session_state and st.session_state['records']:
     
     with v_col1:
         # Tag distribution
-        all_tags = []
-        for r in records:
-            all_tags.extend([t.tag.split('/')[-1] for t in r.semantic_tags])
-        
-        if all_tags:
-            tag_df = pd.DataFrame(all_tags, columns=['Tag']).value_counts().reset_index()
-            tag_df.columns = ['Tag', 'Count']
+        if tag_df is not None:
             fig = px.bar(tag_df, x='Count', y='Tag', orientation='h', title="Top Semantic Tags",
                          color_discrete_sequence=['#007bff'])
             st.plotly_chart(fig, use_container_width=True)
@@ -154,8 +191,6 @@ if 'records' in st.session_state and st.session_state['records']:
             
     with v_col2:
         # Agency distribution
-        agency_df = pd.DataFrame([r.agency for r in records], columns=['Agency']).value_counts().reset_index()
-        agency_df.columns = ['Agency', 'Count']
         fig = px.pie(agency_df, values='Count', names='Agency', title="Agency Distribution")
         st.plotly_chart(fig, use_container_width=True)
 
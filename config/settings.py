@@ -33,14 +33,60 @@ DEFAULT_PAGE_SIZE = 25
 MAX_RETRIES = 3
 REQUEST_TIMEOUT = 30  # seconds
 RATE_LIMIT_DELAY = 1.0  # seconds between API calls
+SEARCH_PAGE_CONCURRENCY = 4  # search result pages fetched in parallel
+EXTRACT_PROCESS_MIN_ITEMS = 500  # extract_fields_bulk() uses processes above this
+EXTRACT_PROCESS_CHUNKSIZE = 64  # records sent to a worker process per task
+HTTP_POOL_CONNECTIONS = 4  # per-host connection pools kept (grants.gov, nsf.gov)
+HTTP_POOL_MAXSIZE = 32  # keep-alive connections kept per host
+HTTP_USER_AGENT = "foa-intelligence/1.0"
+
+# ──────────────────────────────────────────────────────────────
+# API Server Settings
+# ──────────────────────────────────────────────────────────────
+# uvicorn worker processes when running `python api.py`. Each worker loads
+# its own ontology, taggers and embedding model, and the embedding
+# micro-batcher only coalesces requests within one process, so raise this
+# only on hosts with memory to spare.
+API_WORKERS = 1
 
 # ──────────────────────────────────────────────────────────────
 # Embedding / Tagging Settings
 # ──────────────────────────────────────────────────────────────
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = "onnx"  # "torch" | "onnx" | "openvino"
+# Model file loaded for non-torch backends: the fp32 ONNX export, whose
+# scores match the torch model that EMBEDDING_SIMILARITY_THRESHOLD was
+# tuned on. Quantized exports shift those scores.
+EMBEDDING_MODEL_FILE = "onnx/model.onnx"
 EMBEDDING_SIMILARITY_THRESHOLD = 0.35
+EMBEDDING_BATCH_SIZE = 64  # texts per forward pass when batch-encoding
+# Storage dtype for ontology reference embeddings: "float32" | "float16".
+# float16 halves memory, but NumPy has no half-precision BLAS, so the
+# similarity matmul is slower on CPU; keep float32 unless memory-bound.
+EMBEDDING_REFERENCE_DTYPE = "float32"
+# Ontologies with more tags than this are searched with a FAISS HNSW index
+# (when faiss is installed) instead of an exact matmul over every tag
+EMBEDDING_ANN_MIN_TAGS = 2000
+EMBEDDING_ANN_K = 50  # neighbours retrieved per query from the ANN index
+MICRO_BATCH_MAX_SIZE = 32  # API: max texts coalesced into one encode call
+MICRO_BATCH_MAX_WAIT_MS = 10  # API: how long to wait for more texts
 MAX_TAGS_PER_FOA = 10
 
+# ──────────────────────────────────────────────────────────────
+# Caching
+# ──────────────────────────────────────────────────────────────
+SEMANTIC_CACHE_ENABLED = True  # reuse results of semantically similar searches
+SEMANTIC_CACHE_PATH = CACHE_DIR / "semantic_cache.db"
+SEMANTIC_CACHE_TTL = 24 * 3600  # seconds
+SEMANTIC_CACHE_THRESHOLD = 0.9  # min cosine similarity between queries
+URL_CACHE_MAXSIZE = 1024  # single-URL results kept in memory
+URL_CACHE_TTL = 3600  # seconds
+RESPONSE_CACHE_DIR = CACHE_DIR / "responses"  # raw API responses by source
+FETCH_CACHE_TTL = 24 * 3600  # seconds a fetched FOA stays cached
+FETCH_CACHE_MAXSIZE = 4096  # fetched FOAs kept in memory
+RULE_TAG_CACHE_MAXSIZE = 10000  # rule-based tag results kept per tagger
+EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"  # ontology reference embeddings
+
 # ──────────────────────────────────────────────────────────────
 # Source Identifiers
 # ──────────────────────────────────────────────────────────────
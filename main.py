@@ -8,6 +8,7 @@ Usage:
     python main.py --url "<FOA_URL>" --out_dir ./out
     python main.py --search "artificial intelligence" --source grants_gov --out_dir ./out
     python main.py --url "<FOA_URL>" --out_dir ./out --use-embeddings
+    python main.py --clear-cache
 
 Examples:
     # Ingest a single Grants.gov opportunity
@@ -22,20 +23,28 @@ Examples:
 
 import argparse
 import logging
+import os
+import re
 import sys
+import threading
+import uuid
 from pathlib import Path
-from datetime import date
+from datetime import date, datetime, timezone
+from typing import Optional
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.ingestion.grants_gov import GrantsGovIngestor
-from src.ingestion.nsf import NSFIngestor
 from src.extraction.schema import FOARecord
-from src.tagging.rule_based import RuleBasedTagger
-from src.tagging.ontology import Ontology
 from src.export.exporters import export_json, export_csv
-from config.settings import DEFAULT_OUTPUT_DIR, MAX_TAGS_PER_FOA
+from src.cache.ttl_cache import TTLCache
+from config.settings import (
+    DEFAULT_OUTPUT_DIR,
+    MAX_TAGS_PER_FOA,
+    SEMANTIC_CACHE_ENABLED,
+    URL_CACHE_MAXSIZE,
+    URL_CACHE_TTL,
+)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -52,38 +61,89 @@ logger = logging.getLogger("foa-intelligence")
 # ──────────────────────────────────────────────────────────────
 # Source Detection
 # ──────────────────────────────────────────────────────────────
+_SOURCE_RE = re.compile(r"(grants\.gov)|(nsf\.gov)", re.IGNORECASE)
+_SOURCE_BY_GROUP = {1: "grants_gov", 2: "nsf"}
+
+
 def detect_source(url: str) -> str:
     """Detect the FOA source from a URL."""
-    url_lower = url.lower()
-    if "grants.gov" in url_lower:
-        return "grants_gov"
-    elif "nsf.gov" in url_lower:
-        return "nsf"
-    else:
-        logger.warning(f"Unknown source for URL: {url}. Defaulting to grants_gov.")
-        return "grants_gov"
+    match = _SOURCE_RE.search(url)
+    if match:
+        return _SOURCE_BY_GROUP[match.lastindex]
+    logger.warning(f"Unknown source for URL: {url}. Defaulting to grants_gov.")
+    return "grants_gov"
 
 
 def get_ingestor(source: str):
-    """Get the appropriate ingestor for the source."""
-    ingestors = {
-        "grants_gov": GrantsGovIngestor,
-        "nsf": NSFIngestor,
-    }
-    ingestor_class = ingestors.get(source)
-    if not ingestor_class:
-        raise ValueError(f"Unknown source: {source}. Valid: {list(ingestors.keys())}")
-    return ingestor_class()
+    """
+    Get the appropriate ingestor for the source.
+
+    Ingestor modules are imported on first use to keep startup cheap.
+    """
+    if source == "grants_gov":
+        from src.ingestion.grants_gov import GrantsGovIngestor
+
+        return GrantsGovIngestor()
+    if source == "nsf":
+        from src.ingestion.nsf import NSFIngestor
+
+        return NSFIngestor()
+    raise ValueError(f"Unknown source: {source}. Valid: ['grants_gov', 'nsf']")
 
 
 # ──────────────────────────────────────────────────────────────
 # Pipeline Orchestration
 # ──────────────────────────────────────────────────────────────
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _parse_date(value) -> Optional[date]:
+    """
+    Convert an ISO date string (as produced by the ingestors) to a date.
+
+    Non-ISO strings become None without raising; date objects and None
+    pass through unchanged.
+    """
+    if isinstance(value, str):
+        if not _ISO_DATE_RE.fullmatch(value):
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:  # e.g. "2025-02-30"
+            return None
+    return value
+
+
+_url_cache = TTLCache(maxsize=URL_CACHE_MAXSIZE, ttl=URL_CACHE_TTL)
+
+
+def _build_record(fields: dict) -> FOARecord:
+    """Build a FOARecord from ingestor output, parsing its date strings first."""
+    fields["open_date"] = _parse_date(fields.get("open_date"))
+    fields["close_date"] = _parse_date(fields.get("close_date"))
+    return FOARecord(**fields)
+
+
 def process_single_url(url: str, use_embeddings: bool = False) -> FOARecord:
     """
     Full pipeline for a single FOA URL:
     Ingest → Extract → Tag → Return FOARecord
+
+    Results are cached per (url, use_embeddings) for URL_CACHE_TTL seconds.
     """
+    cache_key = (url, use_embeddings)
+    record = _url_cache.get(cache_key)
+    if record is not None:
+        logger.info(f"Returning cached result for URL: {url}")
+        return record
+
+    record = _process_single_url(url, use_embeddings)
+    _url_cache.set(cache_key, record)
+    return record
+
+
+def _process_single_url(url: str, use_embeddings: bool) -> FOARecord:
+    """Run the uncached single-URL pipeline."""
     # 1. Detect source and get ingestor
     source = detect_source(url)
     ingestor = get_ingestor(source)
@@ -108,17 +168,12 @@ def process_single_url(url: str, use_embeddings: bool = False) -> FOARecord:
     )
     fields["semantic_tags"] = tags[:MAX_TAGS_PER_FOA]
 
-    # 5. Parse dates properly
-    for date_field in ["open_date", "close_date"]:
-        val = fields.get(date_field)
-        if isinstance(val, str):
-            try:
-                fields[date_field] = date.fromisoformat(val)
-            except (ValueError, TypeError):
-                fields[date_field] = None
-
-    # 6. Create FOARecord
-    record = FOARecord(**fields)
+    # Fall back to the schema's generated UUID when the source has no ID
+    if not fields.get("foa_id"):
+        fields.pop("foa_id", None)
+
+    # 5. Parse dates and create FOARecord
+    record = _build_record(fields)
     logger.info(
         f"✅ Processed: {record.title[:60]} | "
         f"{len(record.semantic_tags)} tags applied"
@@ -134,47 +189,229 @@ def process_search(
 ) -> list:
     """
     Search and process multiple FOAs.
+
+    Results are served from the semantic cache when a sufficiently
+    similar query was processed recently for the same source and limit.
+
+    Fields are extracted in bulk (across processes for large result sets)
+    and rule-based tags applied per result; embedding-based tags (if
+    enabled) are computed for all results in one batch. Results that
+    fail to process are logged and skipped.
     """
     ingestor = get_ingestor(source)
+
+    # Semantic cache lookup. A rule-only search doesn't load the embedding
+    # model just for this, but uses it if it's already loaded.
+    cache_namespace = f"{source}:{max_results}:{int(use_embeddings)}"
+    query_embedding = None
+    if SEMANTIC_CACHE_ENABLED and (use_embeddings or _embedding_tagger is not None):
+        query_embedding = _embed_query(keyword)
+    if query_embedding is not None:
+        cached = _get_semantic_cache().lookup(query_embedding, cache_namespace)
+        if cached is not None:
+            logger.info(f"Returning {len(cached)} cached results for: '{keyword}'")
+            return cached
+
     logger.info(f"Searching {source} for: '{keyword}' (max: {max_results})")
 
     # Search
     raw_results = ingestor.search(keyword, max_results=max_results)
     logger.info(f"Found {len(raw_results)} results")
 
-    records = []
-    for i, raw_data in enumerate(raw_results):
+    if not raw_results:
+        return []
+
+    total = len(raw_results)
+
+    # Extract fields; failed records come back as None
+    extracted = ingestor.extract_fields_bulk(raw_results)
+
+    # Apply rule-based tags
+    prepared = []
+    for i, fields in enumerate(extracted):
+        if fields is None:
+            continue
         try:
-            fields = ingestor.extract_fields(raw_data)
+            fields["semantic_tags"] = _get_rule_tagger().tag(
+                fields.get("title", ""),
+                fields.get("program_description", ""),
+                top_k=MAX_TAGS_PER_FOA,
+            )
+            prepared.append((i, fields))
+        except Exception as e:
+            logger.warning(f"  [{i+1}/{total}] Failed: {e}")
 
-            # Apply tags
-            tags = apply_tags(
-                title=fields.get("title", ""),
-                description=fields.get("program_description", ""),
-                use_embeddings=use_embeddings,
+    # Embedding-based tags for all records in a single batched encode
+    embed_tag_lists = [[] for _ in prepared]
+    if use_embeddings and prepared:
+        try:
+            embed_tag_lists = _get_embedding_tagger().tag_batch(
+                [
+                    (fields.get("title", ""), fields.get("program_description", ""))
+                    for _, fields in prepared
+                ],
+                top_k=MAX_TAGS_PER_FOA,
+            )
+        except ImportError:
+            logger.warning(
+                "sentence-transformers not installed. "
+                "Skipping embedding-based tagging."
             )
-            fields["semantic_tags"] = tags[:MAX_TAGS_PER_FOA]
 
-            # Parse dates
-            for date_field in ["open_date", "close_date"]:
-                val = fields.get(date_field)
-                if isinstance(val, str):
-                    try:
-                        fields[date_field] = date.fromisoformat(val)
-                    except (ValueError, TypeError):
-                        fields[date_field] = None
+    # One ingestion timestamp for the whole batch
+    ingested_at = datetime.now(timezone.utc)
+
+    # Results without a source ID get a UUID; draw the random bytes for
+    # the whole batch from a single os.urandom call
+    missing_ids = [fields for _, fields in prepared if not fields.get("foa_id")]
+    if missing_ids:
+        entropy = os.urandom(16 * len(missing_ids))
+        for j, fields in enumerate(missing_ids):
+            fields["foa_id"] = str(
+                uuid.UUID(bytes=entropy[16 * j:16 * (j + 1)], version=4)
+            )
 
-            record = FOARecord(**fields)
+    records = []
+    for (i, fields), embed_tags in zip(prepared, embed_tag_lists):
+        try:
+            tags = _dedupe_tags(fields["semantic_tags"] + embed_tags)
+            fields["semantic_tags"] = tags[:MAX_TAGS_PER_FOA]
+
+            fields["ingested_at"] = ingested_at
+            record = _build_record(fields)
             records.append(record)
-            logger.info(f"  [{i+1}/{len(raw_results)}] {record.title[:60]}")
+            logger.info(f"  [{i+1}/{total}] {record.title[:60]}")
 
         except Exception as e:
-            logger.warning(f"  [{i+1}/{len(raw_results)}] Failed: {e}")
+            logger.warning(f"  [{i+1}/{total}] Failed: {e}")
             continue
 
+    if query_embedding is not None and records:
+        _get_semantic_cache().put(query_embedding, cache_namespace, records)
+
     return records
 
 
+# Process-wide singletons. Each is built under its own lock so concurrent
+# first calls (e.g. API requests in worker threads) share one instance
+# instead of each loading their own.
+_ontology = None
+_ontology_lock = threading.Lock()
+_rule_tagger = None
+_rule_tagger_lock = threading.Lock()
+_embedding_tagger = None
+_embedding_tagger_lock = threading.Lock()
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+
+def _get_ontology():
+    """Load the ontology once per process."""
+    global _ontology
+    if _ontology is None:
+        with _ontology_lock:
+            if _ontology is None:
+                from src.tagging.ontology import Ontology
+
+                _ontology = Ontology()
+    return _ontology
+
+
+def _get_rule_tagger():
+    """Build the rule-based tagger once per process."""
+    global _rule_tagger
+    if _rule_tagger is None:
+        with _rule_tagger_lock:
+            if _rule_tagger is None:
+                from src.tagging.rule_based import RuleBasedTagger
+
+                _rule_tagger = RuleBasedTagger(ontology=_get_ontology())
+    return _rule_tagger
+
+
+_micro_batching_enabled = False
+
+
+def enable_micro_batching():
+    """
+    Coalesce embedding encodes from concurrent pipeline calls into shared
+    batches. Intended for servers; call before the first request.
+    """
+    global _micro_batching_enabled
+    _micro_batching_enabled = True
+
+
+def _get_embedding_tagger():
+    """
+    Build the embedding tagger once per process, keeping the loaded
+    model alive across calls. Raises ImportError if sentence-transformers
+    is not installed.
+    """
+    global _embedding_tagger
+    if _embedding_tagger is None:
+        with _embedding_tagger_lock:
+            if _embedding_tagger is None:
+                from src.tagging.embedding_tagger import EmbeddingTagger
+
+                tagger = EmbeddingTagger(ontology=_get_ontology())
+                tagger._lazy_init()
+                if _micro_batching_enabled:
+                    tagger.enable_micro_batching()
+                _embedding_tagger = tagger
+    return _embedding_tagger
+
+
+def _get_semantic_cache():
+    """Open the semantic search cache once per process."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                from src.cache.semantic_cache import SemanticCache
+
+                _semantic_cache = SemanticCache()
+    return _semantic_cache
+
+
+def _embed_query(keyword: str):
+    """Embed a search query, or return None if embeddings are unavailable."""
+    try:
+        return _get_embedding_tagger().encode([keyword])[0]
+    except ImportError:
+        logger.debug("sentence-transformers not installed. Semantic cache disabled.")
+        return None
+    except Exception as e:
+        logger.warning(f"Could not embed search query, skipping semantic cache: {e}")
+        return None
+
+
+def load_taggers(use_embeddings: bool = False) -> list:
+    """
+    Eagerly build the process-wide taggers (and load the embedding model
+    if requested), so the first pipeline call doesn't pay for it.
+    """
+    taggers = [_get_rule_tagger()]
+    if use_embeddings:
+        try:
+            taggers.append(_get_embedding_tagger())
+        except ImportError:
+            logger.warning(
+                "sentence-transformers not installed. "
+                "Skipping embedding-based tagging."
+            )
+    return taggers
+
+
+def clear_caches():
+    """Clear every pipeline cache: URL results, search results, API responses."""
+    from src.cache.response_cache import clear_response_caches
+
+    _url_cache.clear()
+    _get_semantic_cache().clear()
+    clear_response_caches()
+    logger.info("Cleared all caches")
+
+
 def apply_tags(
     title: str,
     description: str,
@@ -183,21 +420,17 @@ def apply_tags(
     """
     Apply semantic tags using rule-based and optionally embedding-based methods.
     """
-    ontology = Ontology()
     all_tags = []
 
-    # Rule-based tagging (always run)
-    rule_tagger = RuleBasedTagger(ontology=ontology)
-    rule_tags = rule_tagger.tag(title, description)
+    # Rule-based tagging (always run); tags past the top MAX_TAGS_PER_FOA
+    # can't survive the final cut, so don't build them
+    rule_tags = _get_rule_tagger().tag(title, description, top_k=MAX_TAGS_PER_FOA)
     all_tags.extend(rule_tags)
 
     # Embedding-based tagging (optional, requires sentence-transformers)
     if use_embeddings:
         try:
-            from src.tagging.embedding_tagger import EmbeddingTagger
-
-            embed_tagger = EmbeddingTagger(ontology=ontology)
-            embed_tags = embed_tagger.tag(title, description)
+            embed_tags = _get_embedding_tagger().tag(title, description)
             all_tags.extend(embed_tags)
         except ImportError:
             logger.warning(
@@ -205,14 +438,16 @@ def apply_tags(
                 "Skipping embedding-based tagging."
             )
 
-    # Deduplicate: keep highest confidence per tag
-    seen = {}
-    for tag in all_tags:
-        key = tag.tag
-        if key not in seen or tag.confidence > seen[key].confidence:
-            seen[key] = tag
+    return _dedupe_tags(all_tags)
 
-    return sorted(seen.values(), key=lambda t: t.confidence, reverse=True)
+
+def _dedupe_tags(all_tags: list) -> list:
+    """Keep the highest-confidence tag per tag path, sorted by confidence."""
+    # After a descending sort, the first occurrence of each path is its best
+    seen = {}
+    for tag in sorted(all_tags, key=lambda t: t.confidence, reverse=True):
+        seen.setdefault(tag.tag, tag)
+    return list(seen.values())
 
 
 # ──────────────────────────────────────────────────────────────
@@ -242,6 +477,11 @@ Examples:
         type=str,
         help="Keyword to search for FOAs.",
     )
+    input_group.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Clear all cached API responses and pipeline results, then exit.",
+    )
 
     # Search options
     parser.add_argument(
@@ -292,6 +532,11 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    if args.clear_cache:
+        clear_caches()
+        print("All caches cleared.")
+        return
+
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,107 @@
+"""
+Response Cache — Two-level (memory + disk) cache for raw API responses.
+
+Raw FOA payloads fetched by ID are kept in an in-memory LRU for fast
+repeat access within a process, and written as JSON files under
+data/cache/responses/<source>/ so they survive restarts and can be
+shared between worker processes. Both levels expire after a TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+from src.cache.ttl_cache import TTLCache
+from config.settings import (
+    RESPONSE_CACHE_DIR,
+    FETCH_CACHE_TTL,
+    FETCH_CACHE_MAXSIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Memory + disk cache of JSON-serializable responses for one source."""
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: Optional[Path] = None,
+        ttl: float = FETCH_CACHE_TTL,
+        maxsize: int = FETCH_CACHE_MAXSIZE,
+    ):
+        self.namespace = namespace
+        self.directory = Path(directory or RESPONSE_CACHE_DIR) / namespace
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _path(self, key: Hashable) -> Path:
+        digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=16).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        """Return the cached response for key, or None on a miss."""
+        value = self._memory.get(key)
+        if value is not None:
+            return value
+
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self._memory.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: dict):
+        """Store a response in memory and on disk."""
+        self._memory.set(key, value)
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, default=str, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write response cache entry {path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop all entries from memory and disk."""
+        self._memory.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(namespace: str) -> ResponseCache:
+    """Return the process-wide response cache for a source."""
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = _caches[namespace] = ResponseCache(namespace)
+        return cache
+
+
+def clear_response_caches():
+    """Clear every source's response cache, including files on disk."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+    shutil.rmtree(RESPONSE_CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,151 @@
+"""
+Semantic Cache — Reuse search results across paraphrased queries.
+
+Stores processed search results in SQLite together with the embedding
+of the query that produced them. A lookup embeds the incoming query and
+returns the records of the most similar cached query, provided their
+cosine similarity clears a threshold. Entries are namespaced (e.g. per
+source and result limit) and expire after a TTL.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from src.extraction.schema import FOARecord
+from config.settings import (
+    SEMANTIC_CACHE_PATH,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+_RECORDS_ADAPTER = TypeAdapter(List[FOARecord])
+
+
+class SemanticCache:
+    """SQLite-backed cache of search results keyed by query embedding."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+    ):
+        self.path = Path(path or SEMANTIC_CACHE_PATH)
+        self.ttl = ttl
+        self.threshold = threshold
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    records TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_namespace "
+                "ON search_cache (namespace, created_at)"
+            )
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def lookup(self, query_embedding, namespace: str) -> Optional[List[FOARecord]]:
+        """
+        Find cached records for a semantically similar query.
+
+        Args:
+            query_embedding: Embedding of the incoming query.
+            namespace: Cache namespace (e.g. "grants_gov:10:0").
+
+        Returns:
+            Cached FOARecords, or None on a miss (or if the cache can't
+            be read, e.g. while another worker holds the database lock).
+        """
+        try:
+            return self._lookup(query_embedding, namespace)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Semantic cache lookup failed in '{namespace}': {e}")
+            return None
+
+    def _lookup(self, query_embedding, namespace: str) -> Optional[List[FOARecord]]:
+        query = self._normalize(query_embedding)
+        cutoff = time.time() - self.ttl
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, embedding FROM search_cache "
+                "WHERE namespace = ? AND created_at >= ?",
+                (namespace, cutoff),
+            ).fetchall()
+
+        # Skip entries embedded with a model of another dimension
+        rows = [(row_id, blob) for row_id, blob in rows if len(blob) == query.nbytes]
+        if not rows:
+            return None
+
+        embeddings = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+        similarities = embeddings @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT records FROM search_cache WHERE id = ?", (rows[best][0],)
+            ).fetchone()
+        if row is None:
+            return None
+
+        logger.info(
+            f"Semantic cache hit in '{namespace}' "
+            f"(similarity={similarities[best]:.3f})"
+        )
+        return _RECORDS_ADAPTER.validate_json(row[0])
+
+    def put(self, query_embedding, namespace: str, records: List[FOARecord]):
+        """
+        Store the records produced for a query, evicting expired entries.
+
+        Failures are logged and ignored; caching never fails a search.
+        """
+        query = self._normalize(query_embedding)
+        now = time.time()
+
+        try:
+            payload = _RECORDS_ADAPTER.dump_json(records).decode("utf-8")
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl,)
+                )
+                self._conn.execute(
+                    "INSERT INTO search_cache (namespace, embedding, records, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (namespace, query.tobytes(), payload, now),
+                )
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not store semantic cache entry in '{namespace}': {e}")
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_cache")
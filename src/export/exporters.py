@@ -3,15 +3,35 @@ JSON & CSV Exporters — Write FOA records to structured output files.
 """
 
 import csv
-import json
 import logging
 from pathlib import Path
 from typing import List
 
+from pydantic import TypeAdapter
+
 from src.extraction.schema import FOARecord
 
 logger = logging.getLogger(__name__)
 
+_RECORDS_ADAPTER = TypeAdapter(List[FOARecord])
+
+# CSV columns, in the order produced by FOARecord.to_flat_dict()
+CSV_FIELDNAMES = (
+    "foa_id",
+    "title",
+    "agency",
+    "open_date",
+    "close_date",
+    "eligibility",
+    "program_description",
+    "award_range_min",
+    "award_range_max",
+    "source_url",
+    "source",
+    "semantic_tags",
+    "ingested_at",
+)
+
 
 def export_json(records: List[FOARecord], output_path: Path) -> Path:
     """
@@ -27,10 +47,8 @@ def export_json(records: List[FOARecord], output_path: Path) -> Path:
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = [record.model_dump(mode="json") for record in records]
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+    # Serialize the whole list in one pydantic-core (Rust) pass
+    output_path.write_bytes(_RECORDS_ADAPTER.dump_json(records, indent=2))
 
     logger.info(f"Exported {len(records)} FOA records to {output_path}")
     return output_path
@@ -56,16 +74,13 @@ def export_csv(records: List[FOARecord], output_path: Path) -> Path:
         logger.warning("No records to export to CSV")
         return output_path
 
-    # Get flat dictionaries
-    flat_records = [record.to_flat_dict() for record in records]
-
-    # Determine CSV columns from the first record
-    fieldnames = list(flat_records[0].keys())
-
     with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(
+            f, fieldnames=CSV_FIELDNAMES, quoting=csv.QUOTE_MINIMAL
+        )
         writer.writeheader()
-        writer.writerows(flat_records)
+        # Stream rows instead of materializing every flat dict up front
+        writer.writerows(record.to_flat_dict() for record in records)
 
     logger.info(f"Exported {len(records)} FOA records to {output_path}")
     return output_path
@@ -5,18 +5,36 @@ Defines the standardized schema that all FOA records must conform to,
 regardless of their source (Grants.gov, NSF, etc.).
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import date, datetime
+from datetime import date, datetime, timezone
+from functools import cached_property
 import uuid
 
 
+def _utcnow() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow is deprecated)."""
+    return datetime.now(timezone.utc)
+
+
 class SemanticTag(BaseModel):
-    """A semantic tag applied to an FOA."""
+    """
+    A semantic tag applied to an FOA.
+
+    Immutable: taggers cache their results and hand the same instances
+    to every FOA with matching text.
+    """
+    model_config = ConfigDict(frozen=True)
+
     tag: str                          # e.g., "research_domains/artificial_intelligence"
     confidence: float = Field(ge=0.0, le=1.0)
     method: str                       # "rule_based" | "embedding" | "llm"
 
+    @cached_property
+    def short(self) -> str:
+        """Tag name without its category (e.g., 'artificial_intelligence')."""
+        return self.tag.rsplit("/", 1)[-1]
+
 
 class FOARecord(BaseModel):
     """
@@ -70,7 +88,7 @@ class FOARecord(BaseModel):
         description="Semantic tags applied to this FOA."
     )
     ingested_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=_utcnow,
         description="Timestamp when this FOA was ingested."
     )
 
@@ -79,14 +97,22 @@ class FOARecord(BaseModel):
         Convert to a flat dictionary suitable for CSV export.
         Semantic tags are joined as a semicolon-separated string.
         """
-        data = self.model_dump()
-        # Flatten dates to ISO strings
-        data["open_date"] = self.open_date.isoformat() if self.open_date else ""
-        data["close_date"] = self.close_date.isoformat() if self.close_date else ""
-        data["ingested_at"] = self.ingested_at.isoformat()
-        # Flatten semantic tags
-        data["semantic_tags"] = "; ".join(
-            f"{t.tag} ({t.confidence:.2f}, {t.method})"
-            for t in self.semantic_tags
-        )
-        return data
+        return {
+            "foa_id": self.foa_id,
+            "title": self.title,
+            "agency": self.agency,
+            "open_date": self.open_date.isoformat() if self.open_date else "",
+            "close_date": self.close_date.isoformat() if self.close_date else "",
+            "eligibility": self.eligibility,
+            "program_description": self.program_description,
+            "award_range_min": self.award_range_min,
+            "award_range_max": self.award_range_max,
+            "source_url": self.source_url,
+            "source": self.source,
+            # Flatten semantic tags
+            "semantic_tags": "; ".join(
+                f"{t.tag} ({t.confidence:.2f}, {t.method})"
+                for t in self.semantic_tags
+            ),
+            "ingested_at": self.ingested_at.isoformat(),
+        }
@@ -6,14 +6,197 @@ this interface for consistent pipeline behavior.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import functools
 import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config.settings import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_USER_AGENT,
+    MAX_RETRIES,
+    RATE_LIMIT_DELAY,
+    SEARCH_PAGE_CONCURRENCY,
+    EXTRACT_PROCESS_MIN_ITEMS,
+    EXTRACT_PROCESS_CHUNKSIZE,
+)
+from src.cache.response_cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
+_shared_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session used by all ingestors.
+
+    Sharing one session keeps the per-host connection pools (and their
+    TLS connections) alive across ingestor instances, pagination loops
+    and pipeline calls. Connection errors, 429s and 5xx responses are
+    retried by the adapter with exponential backoff, honouring any
+    Retry-After header.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=MAX_RETRIES - 1,  # MAX_RETRIES counts attempts
+                    backoff_factor=RATE_LIMIT_DELAY,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET", "POST"),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,  # surface the last response via raise_for_status
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=retry,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "User-Agent": HTTP_USER_AGENT,
+                    "Connection": "keep-alive",
+                    # gzip/deflate, plus br/zstd when urllib3 can decode them
+                    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+                })
+                _shared_session = session
+    return _shared_session
+
+
+def parse_json(response: requests.Response):
+    """
+    Decode a JSON response body, using orjson when it is installed.
+
+    Raises requests' JSONDecodeError on malformed bodies either way, so
+    callers handling requests.RequestException keep working.
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+class RequestPacer:
+    """Spaces out the start of requests to one API by a minimum interval."""
+
+    def __init__(self, interval: float = RATE_LIMIT_DELAY):
+        self.interval = interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's turn to send a request."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+_pacers: Dict[str, RequestPacer] = {}
+_pacers_lock = threading.Lock()
+
+
+def get_request_pacer(source: str) -> RequestPacer:
+    """Return the process-wide request pacer for a source's API."""
+    with _pacers_lock:
+        pacer = _pacers.get(source)
+        if pacer is None:
+            pacer = _pacers[source] = RequestPacer()
+        return pacer
+
+
+def _extract_one(ingestor: "BaseIngestor", raw_data: dict) -> Optional[dict]:
+    # Module-level so it can be pickled into worker processes
+    try:
+        return ingestor.extract_fields(raw_data)
+    except Exception as e:
+        logger.warning(f"Failed to extract {ingestor.source_name} record: {e}")
+        return None
+
 
 class BaseIngestor(ABC):
-    """Abstract base class for FOA data sources."""
+    """
+    Abstract base class for FOA data sources.
+
+    Subclasses should issue all HTTP requests through ``self.session``
+    (the shared keep-alive session) rather than ``requests.get/post``.
+    """
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled HTTP session shared by all ingestors in this process."""
+        return get_shared_session()
+
+    def _fetch_pages(
+        self,
+        fetch_page: Callable[[int], List[dict]],
+        offsets: List[int],
+        page_size: int,
+    ) -> List[dict]:
+        """
+        Fetch search result pages concurrently and concatenate them in order.
+
+        The first page is fetched on its own; the remaining offsets are only
+        requested (SEARCH_PAGE_CONCURRENCY at a time) if it came back full.
+        Every page request waits its turn on the source's pacer, so requests
+        to one API start at least RATE_LIMIT_DELAY apart, even across
+        concurrent searches. Results stop at the first empty or failed page.
+
+        Args:
+            fetch_page: Callable returning the hits at a given offset.
+            offsets: Page offsets to fetch, in order.
+            page_size: Number of hits requested per page.
+
+        Returns:
+            Concatenated hits from all pages up to the first empty one.
+        """
+        pacer = get_request_pacer(self.source_name)
+
+        def _get(offset: int) -> Optional[List[dict]]:
+            pacer.wait()
+            try:
+                return fetch_page(offset)
+            except requests.RequestException as e:
+                logger.error(f"Search failed at offset {offset}: {e}")
+                return None
+
+        if not offsets:
+            return []
+
+        pages = [_get(offsets[0])]
+        if pages[0] and len(pages[0]) >= page_size and len(offsets) > 1:
+            workers = min(SEARCH_PAGE_CONCURRENCY, len(offsets) - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages.extend(executor.map(_get, offsets[1:]))
+
+        results = []
+        for page in pages:
+            if not page:
+                break
+            results.extend(page)
+        return results
 
     @property
     @abstractmethod
@@ -34,6 +217,38 @@ class BaseIngestor(ABC):
         """
         ...
 
+    @abstractmethod
+    def _fetch_by_id(self, item_id) -> dict:
+        """
+        Fetch a single FOA by its source-specific ID.
+
+        Args:
+            item_id: Opportunity/award ID in the source's format.
+
+        Returns:
+            Raw data dictionary from the source.
+        """
+        ...
+
+    def fetch_by_id(self, item_id) -> dict:
+        """
+        Fetch a single FOA by ID, served from the response cache if possible.
+
+        Successful responses are cached in memory and on disk for
+        FETCH_CACHE_TTL seconds; errors and empty results are not cached.
+        """
+        cache = get_response_cache(self.source_name)
+        key = str(item_id)
+        raw_data = cache.get(key)
+        if raw_data is not None:
+            logger.debug(f"Response cache hit for {self.source_name} item {item_id}")
+            return raw_data
+
+        raw_data = self._fetch_by_id(item_id)
+        if raw_data and not raw_data.get("error"):
+            cache.set(key, raw_data)
+        return raw_data
+
     @abstractmethod
     def search(self, keyword: str, max_results: int = 25) -> List[dict]:
         """
@@ -60,3 +275,28 @@ class BaseIngestor(ABC):
             Dictionary with fields matching FOARecord schema.
         """
         ...
+
+    def extract_fields_bulk(self, raw_results: List[dict]) -> List[Optional[dict]]:
+        """
+        Extract standardized fields from many raw records.
+
+        Batches larger than EXTRACT_PROCESS_MIN_ITEMS are spread over a
+        process pool (extraction is pure CPU, so threads would contend
+        for the GIL); smaller ones run inline, where pool start-up would
+        cost more than it saves.
+
+        Args:
+            raw_results: Raw data dictionaries from the source.
+
+        Returns:
+            Extracted field dicts in input order, with None for records
+            that failed to extract.
+        """
+        extract = functools.partial(_extract_one, self)
+        if len(raw_results) <= EXTRACT_PROCESS_MIN_ITEMS:
+            return [extract(raw_data) for raw_data in raw_results]
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(
+                executor.map(extract, raw_results, chunksize=EXTRACT_PROCESS_CHUNKSIZE)
+            )
@@ -10,7 +10,6 @@ API Endpoints:
 """
 
 import re
-import time
 import logging
 from typing import List, Optional
 from datetime import datetime
@@ -18,18 +17,29 @@ from dateutil import parser as date_parser
 
 import requests
 
-from src.ingestion.base import BaseIngestor
+from src.ingestion.base import BaseIngestor, parse_json
 from config.settings import (
     GRANTS_GOV_SEARCH_URL,
     GRANTS_GOV_FETCH_URL,
     REQUEST_TIMEOUT,
-    MAX_RETRIES,
-    RATE_LIMIT_DELAY,
     SOURCE_GRANTS_GOV,
 )
 
 logger = logging.getLogger(__name__)
 
+# Fields combined into program_description, in priority order
+_DESCRIPTION_FIELDS = ("synopsis", "synopsisDesc", "description", "opportunityTitle")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Date formats returned by the Grants.gov APIs, tried before dateutil
+_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S")
+
+# Opportunity ID in search-results-detail, view-opportunity or ?oppId= URLs
+_OPP_ID_RE = re.compile(
+    r"grants\.gov(?:/search-results-detail/|/view-opportunity/html/\?oppId=|.*[?&]oppId=)(\d+)"
+)
+
 
 class GrantsGovIngestor(BaseIngestor):
     """Ingestor for Grants.gov public API."""
@@ -46,16 +56,8 @@ class GrantsGovIngestor(BaseIngestor):
           - https://www.grants.gov/search-results-detail/123456
           - https://grants.gov/search-results-detail/123456
         """
-        patterns = [
-            r"grants\.gov/search-results-detail/(\d+)",
-            r"grants\.gov/view-opportunity/html/\?oppId=(\d+)",
-            r"grants\.gov.*[?&]oppId=(\d+)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return int(match.group(1))
-        return None
+        match = _OPP_ID_RE.search(url)
+        return int(match.group(1)) if match else None
 
     def fetch_by_url(self, url: str) -> dict:
         """
@@ -67,7 +69,7 @@ class GrantsGovIngestor(BaseIngestor):
         opp_id = self._extract_opportunity_id_from_url(url)
 
         if opp_id:
-            return self._fetch_by_id(opp_id)
+            return self.fetch_by_id(opp_id)
 
         # If we can't extract an ID, try to search by URL components
         logger.warning(
@@ -82,42 +84,33 @@ class GrantsGovIngestor(BaseIngestor):
         
         Tries fetchOpportunity first, falls back to search2 if it fails.
         """
-        # Try fetchOpportunity endpoint first
+        # Try fetchOpportunity endpoint first; transient failures are
+        # retried by the shared session's adapter
         payload = {"oppId": opp_id}
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.post(
-                    GRANTS_GOV_FETCH_URL,
-                    json=payload,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Unwrap 'data' key if present
-                inner = data.get("data", data)
-                
-                # Check if the backend actually returned useful data
-                if inner.get("opportunity") or inner.get("title"):
-                    logger.info(f"Successfully fetched Grants.gov opportunity {opp_id} via fetchOpportunity")
-                    return inner
-                
-                # If fetchOpportunity returned no data, fall through to search fallback
-                if inner.get("message") or not inner.get("opportunity"):
-                    logger.warning(f"fetchOpportunity returned no data for {opp_id}, trying search fallback")
-                    break
-                    
-            except requests.RequestException as e:
-                logger.warning(
-                    f"Attempt {attempt + 1}/{MAX_RETRIES} failed for "
-                    f"opportunity {opp_id}: {e}"
-                )
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RATE_LIMIT_DELAY * (attempt + 1))
-                else:
-                    break  # Fall through to search fallback
-        
+        try:
+            response = self.session.post(
+                GRANTS_GOV_FETCH_URL,
+                json=payload,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = parse_json(response)
+
+            # Unwrap 'data' key if present
+            inner = data.get("data", data)
+
+            # Check if the backend actually returned useful data
+            if inner.get("opportunity") or inner.get("title"):
+                logger.info(f"Successfully fetched Grants.gov opportunity {opp_id} via fetchOpportunity")
+                return inner
+
+            # If fetchOpportunity returned no data, fall through to search fallback
+            logger.warning(f"fetchOpportunity returned no data for {opp_id}, trying search fallback")
+
+        except requests.RequestException as e:
+            logger.warning(f"fetchOpportunity failed for opportunity {opp_id}: {e}")
+
         # Fallback: Use search2 to find the opportunity by ID
         return self._search_by_id_fallback(opp_id)
     
@@ -134,13 +127,13 @@ class GrantsGovIngestor(BaseIngestor):
                 "rows": 5,
                 "offset": 0,
             }
-            response = requests.post(
+            response = self.session.post(
                 GRANTS_GOV_SEARCH_URL,
                 json=payload,
                 timeout=REQUEST_TIMEOUT,
             )
             response.raise_for_status()
-            data = response.json()
+            data = parse_json(response)
             inner = data.get("data", data)
             hits = inner.get("oppHits", [])
             
@@ -171,11 +164,9 @@ class GrantsGovIngestor(BaseIngestor):
         Returns:
             List of opportunity dictionaries.
         """
-        results = []
-        offset = 0
         page_size = min(max_results, 25)
 
-        while len(results) < max_results:
+        def fetch_page(offset: int) -> List[dict]:
             payload = {
                 "keyword": keyword,
                 "oppStatuses": "forecasted|posted",
@@ -183,29 +174,20 @@ class GrantsGovIngestor(BaseIngestor):
                 "rows": page_size,
                 "offset": offset,
             }
+            response = self.session.post(
+                GRANTS_GOV_SEARCH_URL,
+                json=payload,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = parse_json(response)
 
-            try:
-                response = requests.post(
-                    GRANTS_GOV_SEARCH_URL,
-                    json=payload,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Results are nested under "data" key
-                inner = data.get("data", data)
-                opportunities = inner.get("oppHits", [])
-                if not opportunities:
-                    break
-
-                results.extend(opportunities)
-                offset += page_size
-                time.sleep(RATE_LIMIT_DELAY)
-
-            except requests.RequestException as e:
-                logger.error(f"Search failed at offset {offset}: {e}")
-                break
+            # Results are nested under "data" key
+            inner = data.get("data", data)
+            return inner.get("oppHits", [])
+
+        offsets = list(range(0, max_results, page_size)) if max_results > 0 else []
+        results = self._fetch_pages(fetch_page, offsets, page_size)
 
         logger.info(f"Found {len(results)} opportunities for keyword '{keyword}'")
         return results[:max_results]
@@ -257,12 +239,8 @@ class GrantsGovIngestor(BaseIngestor):
             else ""
         )
 
-        # Combine description fields
-        description_parts = []
-        for field in ["synopsis", "synopsisDesc", "description", "opportunityTitle"]:
-            val = opportunity.get(field)
-            if val and isinstance(val, str) and len(val) > 20:
-                description_parts.append(val)
+        # Combine description fields, skipping repeated text
+        description_parts = self._unique_desc_parts(opportunity)
 
         return {
             "foa_id": foa_id,
@@ -278,6 +256,27 @@ class GrantsGovIngestor(BaseIngestor):
             "source": self.source_name,
         }
 
+    def _unique_desc_parts(self, opportunity: dict) -> List[str]:
+        """
+        Collect the description-like fields worth keeping, in priority order.
+
+        synopsis and synopsisDesc (and sometimes the title) often repeat
+        the same text, so candidates are compared on their first 200
+        characters after collapsing whitespace, and repeats are dropped.
+        """
+        parts = []
+        seen = set()
+        for field in _DESCRIPTION_FIELDS:
+            val = opportunity.get(field)
+            if not (val and isinstance(val, str) and len(val) > 20):
+                continue
+            key = _WHITESPACE_RE.sub(" ", val).strip()[:200]
+            if key in seen:
+                continue
+            seen.add(key)
+            parts.append(val)
+        return parts
+
     def _parse_date(self, date_value) -> Optional[str]:
         """Parse various date formats to ISO date string."""
         if not date_value:
@@ -287,8 +286,13 @@ class GrantsGovIngestor(BaseIngestor):
             if isinstance(date_value, (int, float)):
                 dt = datetime.fromtimestamp(date_value / 1000)
                 return dt.date().isoformat()
-            # Handle string dates
+            # Handle string dates: known formats first, generic parser last
             if isinstance(date_value, str):
+                for fmt in _DATE_FORMATS:
+                    try:
+                        return datetime.strptime(date_value, fmt).date().isoformat()
+                    except ValueError:
+                        pass
                 dt = date_parser.parse(date_value)
                 return dt.date().isoformat()
         except (ValueError, TypeError, OverflowError) as e:
@@ -9,25 +9,23 @@ API Endpoint:
 """
 
 import re
-import time
 import logging
 from typing import List, Optional
 from datetime import datetime
 from dateutil import parser as date_parser
 
-import requests
-
-from src.ingestion.base import BaseIngestor
+from src.ingestion.base import BaseIngestor, parse_json
 from config.settings import (
     NSF_AWARDS_URL,
     REQUEST_TIMEOUT,
-    MAX_RETRIES,
-    RATE_LIMIT_DELAY,
     SOURCE_NSF,
 )
 
 logger = logging.getLogger(__name__)
 
+_AWARD_ID_PARAM_RE = re.compile(r"AWD_ID=(\d+)", re.IGNORECASE)
+_AWARD_ID_PATH_RE = re.compile(r"nsf\.gov/.*?/(\d{7})")
+
 
 class NSFIngestor(BaseIngestor):
     """Ingestor for NSF Awards API."""
@@ -64,12 +62,12 @@ class NSFIngestor(BaseIngestor):
           - https://www.nsf.gov/awardsearch/showAward?AWD_ID=2345678
           - https://nsf.gov/awardsearch/showAward?AWD_ID=2345678&HistoricalAwards=false
         """
-        match = re.search(r"AWD_ID=(\d+)", url, re.IGNORECASE)
+        match = _AWARD_ID_PARAM_RE.search(url)
         if match:
             return match.group(1)
 
         # Try direct ID pattern
-        match = re.search(r"nsf\.gov/.*?/(\d{7})", url)
+        match = _AWARD_ID_PATH_RE.search(url)
         if match:
             return match.group(1)
 
@@ -80,7 +78,7 @@ class NSFIngestor(BaseIngestor):
         award_id = self._extract_award_id_from_url(url)
 
         if award_id:
-            return self._fetch_by_id(award_id)
+            return self.fetch_by_id(award_id)
 
         logger.warning(f"Could not extract award ID from URL: {url}")
         return {"source_url": url, "error": "Could not extract award ID"}
@@ -92,33 +90,22 @@ class NSFIngestor(BaseIngestor):
             "printFields": self.PRINT_FIELDS,
         }
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.get(
-                    NSF_AWARDS_URL,
-                    params=params,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                awards = data.get("response", {}).get("award", [])
-                if awards:
-                    logger.info(f"Successfully fetched NSF award {award_id}")
-                    return awards[0]
-                else:
-                    logger.warning(f"No award found with ID {award_id}")
-                    return {}
-
-            except requests.RequestException as e:
-                logger.warning(
-                    f"Attempt {attempt + 1}/{MAX_RETRIES} failed for "
-                    f"award {award_id}: {e}"
-                )
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RATE_LIMIT_DELAY * (attempt + 1))
-                else:
-                    raise
+        # Transient failures are retried by the shared session's adapter
+        response = self.session.get(
+            NSF_AWARDS_URL,
+            params=params,
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        data = parse_json(response)
+
+        awards = data.get("response", {}).get("award", [])
+        if awards:
+            logger.info(f"Successfully fetched NSF award {award_id}")
+            return awards[0]
+        else:
+            logger.warning(f"No award found with ID {award_id}")
+            return {}
 
     def search(self, keyword: str, max_results: int = 25) -> List[dict]:
         """
@@ -131,38 +118,27 @@ class NSFIngestor(BaseIngestor):
         Returns:
             List of award dictionaries.
         """
-        results = []
-        offset = 1  # NSF API uses 1-based offset
         page_size = min(max_results, 25)
 
-        while len(results) < max_results:
+        def fetch_page(offset: int) -> List[dict]:
             params = {
                 "keyword": keyword,
                 "printFields": self.PRINT_FIELDS,
                 "offset": offset,
                 "rpp": page_size,
             }
-
-            try:
-                response = requests.get(
-                    NSF_AWARDS_URL,
-                    params=params,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                awards = data.get("response", {}).get("award", [])
-                if not awards:
-                    break
-
-                results.extend(awards)
-                offset += page_size
-                time.sleep(RATE_LIMIT_DELAY)
-
-            except requests.RequestException as e:
-                logger.error(f"Search failed at offset {offset}: {e}")
-                break
+            response = self.session.get(
+                NSF_AWARDS_URL,
+                params=params,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = parse_json(response)
+            return data.get("response", {}).get("award", [])
+
+        # NSF API uses 1-based offsets
+        offsets = list(range(1, max_results + 1, page_size)) if max_results > 0 else []
+        results = self._fetch_pages(fetch_page, offsets, page_size)
 
         logger.info(f"Found {len(results)} NSF awards for keyword '{keyword}'")
         return results[:max_results]
@@ -227,6 +203,10 @@ class NSFIngestor(BaseIngestor):
         """Parse NSF date format (typically MM/DD/YYYY) to ISO date."""
         if not date_str:
             return None
+        try:
+            return datetime.strptime(date_str, "%m/%d/%Y").date().isoformat()
+        except (ValueError, TypeError):
+            pass
         try:
             dt = date_parser.parse(date_str)
             return dt.date().isoformat()
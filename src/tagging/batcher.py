@@ -0,0 +1,132 @@
+"""
+Micro-Batcher — Coalesces concurrent embedding requests into batches.
+
+When many requests are served concurrently (e.g. by the API), each one
+encodes only a handful of texts. The micro-batcher queues those calls,
+waits a few milliseconds for more to arrive, and runs a single batched
+encode for all of them, handing each caller its slice of the result.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from config.settings import MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Dynamic batching front-end for an encode function.
+
+    Calls from any thread are collected for up to max_wait_ms or until
+    max_batch_size texts are pending, then encoded together on a
+    background worker thread.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for encoding; the future resolves to their embeddings."""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, blocking until their batch has been processed."""
+        return self.submit(texts).result()
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-micro-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            pending = self._collect_batch()
+            try:
+                self._encode_batch(pending)
+            except Exception as e:
+                # Never let the worker die, or later callers block forever
+                logger.exception(f"Micro-batcher failed on a batch: {e}")
+                for _, future in pending:
+                    self._resolve(future, exception=e)
+
+    def _collect_batch(self) -> List[tuple]:
+        """Block for the next call, then gather more until the batch closes."""
+        pending = [self._queue.get()]
+        count = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        # Keep collecting until the batch is full or the window closes
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            count += len(item[0])
+        return pending
+
+    def _encode_batch(self, pending: List[tuple]):
+        """Encode the texts of all live calls and hand each its slice."""
+        # Drop calls whose future from submit() was cancelled; the rest
+        # can no longer be cancelled once marked running
+        pending = [
+            (texts, future) for texts, future in pending
+            if future.set_running_or_notify_cancel()
+        ]
+        if not pending:
+            return
+
+        texts = [text for item_texts, _ in pending for text in item_texts]
+        try:
+            embeddings = self.encode_fn(texts)
+        except Exception as e:
+            for _, future in pending:
+                self._resolve(future, exception=e)
+            return
+
+        logger.debug(f"Micro-batch encoded {len(texts)} texts from {len(pending)} calls")
+
+        offset = 0
+        for item_texts, future in pending:
+            self._resolve(future, result=embeddings[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    @staticmethod
+    def _resolve(future: Future, result=None, exception: Optional[BaseException] = None):
+        """Set a future's outcome, ignoring futures that are already done."""
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
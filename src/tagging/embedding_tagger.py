@@ -5,14 +5,31 @@ Computes cosine similarity between FOA text embeddings and
 pre-computed ontology tag embeddings to assign semantic tags.
 """
 
+import hashlib
+import json
 import logging
-from typing import List, Optional
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 import numpy as np
 
 from src.extraction.schema import SemanticTag
 from src.tagging.ontology import Ontology
-from config.settings import EMBEDDING_MODEL, EMBEDDING_SIMILARITY_THRESHOLD
+from src.tagging.batcher import MicroBatcher
+from config.settings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL_FILE,
+    EMBEDDING_SIMILARITY_THRESHOLD,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_REFERENCE_DTYPE,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_ANN_MIN_TAGS,
+    EMBEDDING_ANN_K,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,30 +47,50 @@ class EmbeddingTagger:
         ontology: Optional[Ontology] = None,
         model_name: str = EMBEDDING_MODEL,
         threshold: float = EMBEDDING_SIMILARITY_THRESHOLD,
+        backend: str = EMBEDDING_BACKEND,
+        reference_dtype: str = EMBEDDING_REFERENCE_DTYPE,
+        cache_dir: Optional[Path] = EMBEDDING_CACHE_DIR,
     ):
         self.ontology = ontology or Ontology()
         self.model_name = model_name
+        self.backend = backend
         self.threshold = threshold
+        self.reference_dtype = np.dtype(reference_dtype)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.model = None
         self.reference_embeddings = None
         self.tag_paths: List[str] = []
+        self._ann_index = None
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._batcher: Optional[MicroBatcher] = None
 
     def _lazy_init(self):
         """
         Lazily initialize the model and reference embeddings.
         This avoids expensive model loading until actually needed.
+        Safe to call from multiple threads; the model is loaded once.
         """
         if self._initialized:
             return
 
+        with self._init_lock:
+            if not self._initialized:
+                self._load_model()
+
+    def _load_model(self):
+        """Load the sentence-transformers model and build reference embeddings."""
         try:
             from sentence_transformers import SentenceTransformer
-            from sklearn.metrics.pairwise import cosine_similarity
 
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
-            self._cosine_similarity = cosine_similarity
+            logger.info(
+                f"Loading embedding model: {self.model_name} "
+                f"(backend: {self.backend})"
+            )
+            if self.backend == "torch":
+                self.model = SentenceTransformer(self.model_name)
+            else:
+                self.model = self._load_accelerated_model(SentenceTransformer)
             self._build_reference_embeddings()
             self._initialized = True
             logger.info(
@@ -62,31 +99,168 @@ class EmbeddingTagger:
 
         except ImportError as e:
             logger.error(
-                f"sentence-transformers or scikit-learn not installed: {e}. "
+                f"sentence-transformers not installed: {e}. "
                 "Embedding tagger will not be available."
             )
             raise
 
+    def _load_accelerated_model(self, model_cls):
+        """
+        Load the model on the configured ONNX/OpenVINO backend, falling
+        back to the default PyTorch backend if that backend's extras
+        (optimum, onnxruntime, ...) or the model file are unavailable.
+        """
+        model_kwargs = (
+            {"file_name": EMBEDDING_MODEL_FILE} if EMBEDDING_MODEL_FILE else None
+        )
+        try:
+            return model_cls(
+                self.model_name,
+                backend=self.backend,
+                model_kwargs=model_kwargs,
+            )
+        except Exception as e:
+            # sentence-transformers raises a bare Exception for missing extras
+            logger.warning(
+                f"Could not load {self.backend} backend ({e}); "
+                "falling back to torch"
+            )
+            self.backend = "torch"
+            return model_cls(self.model_name)
+
     def _build_reference_embeddings(self):
-        """Pre-compute embeddings for all ontology tag descriptions."""
-        tag_texts = []
-        self.tag_paths = []
-
-        for tag in self.ontology.get_all_tags():
-            # Create a representative text for each tag
-            terms = tag.all_terms
-            text = " ".join(terms)
-            tag_texts.append(text)
-            self.tag_paths.append(tag.full_path)
-
-        self.reference_embeddings = self.model.encode(
-            tag_texts,
-            show_progress_bar=False,
-            normalize_embeddings=True,
+        """
+        Pre-compute embeddings for all ontology tag descriptions.
+
+        Embeddings are persisted under cache_dir, keyed by a hash of the
+        tag texts and model settings, and memory-mapped on later starts so
+        worker processes skip the encode and share the pages.
+        """
+        # A representative text for each tag: its name plus all synonyms
+        tag_texts = self.ontology.all_terms_joined
+        tag_paths = [tag.full_path for tag in self.ontology.get_all_tags()]
+
+        cache_path = self._reference_cache_path(tag_texts, tag_paths)
+        if cache_path is None or not self._load_reference_embeddings(cache_path):
+            self._encode_reference_embeddings(tag_texts, tag_paths, cache_path)
+
+        if len(self.tag_paths) > EMBEDDING_ANN_MIN_TAGS:
+            self._build_ann_index(cache_path)
+
+    def _encode_reference_embeddings(
+        self,
+        tag_texts: List[str],
+        tag_paths: List[str],
+        cache_path: Optional[Path],
+    ):
+        self.tag_paths = tag_paths
+        # Contiguous float32 so similarity is a single BLAS SGEMM; both sides
+        # are L2-normalized, so the dot product is the cosine similarity
+        self.reference_embeddings = np.ascontiguousarray(
+            self.model.encode(
+                tag_texts,
+                show_progress_bar=False,
+                normalize_embeddings=True,
+            ),
+            dtype=self.reference_dtype,
         )
 
         logger.info(f"Built {len(tag_texts)} reference embeddings")
 
+        if cache_path is not None:
+            self._save_reference_embeddings(cache_path)
+
+    def _build_ann_index(self, cache_path: Optional[Path]):
+        """
+        Build (or load from cache) a FAISS HNSW index over the reference
+        embeddings. Without faiss, tagging keeps using the exact matmul.
+        """
+        try:
+            import faiss
+        except ImportError:
+            logger.info(
+                f"faiss not installed; using exact search over "
+                f"{len(self.tag_paths)} reference tags"
+            )
+            return
+
+        index_path = cache_path.with_suffix(".faiss") if cache_path is not None else None
+        if index_path is not None and index_path.exists():
+            try:
+                self._ann_index = faiss.read_index(str(index_path))
+                logger.info(f"Loaded ANN index from {index_path}")
+                return
+            except RuntimeError as e:
+                logger.warning(f"Could not read ANN index {index_path}: {e}")
+
+        # Inner product equals cosine similarity on L2-normalized vectors
+        vectors = np.ascontiguousarray(self.reference_embeddings, dtype=np.float32)
+        index = faiss.IndexHNSWFlat(vectors.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = max(index.hnsw.efSearch, 2 * EMBEDDING_ANN_K)
+        index.add(vectors)
+        self._ann_index = index
+        logger.info(f"Built HNSW index over {len(self.tag_paths)} reference tags")
+
+        if index_path is not None:
+            try:
+                faiss.write_index(index, str(index_path))
+            except RuntimeError as e:
+                logger.warning(f"Could not cache ANN index at {index_path}: {e}")
+
+    def _reference_cache_path(
+        self, tag_texts: List[str], tag_paths: List[str]
+    ) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        key = json.dumps(
+            [
+                self.model_name,
+                self.backend,
+                EMBEDDING_MODEL_FILE if self.backend != "torch" else None,
+                self.reference_dtype.str,
+                tag_paths,
+                tag_texts,
+            ]
+        )
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        return self.cache_dir / f"ref_emb_{digest}.npy"
+
+    def _load_reference_embeddings(self, cache_path: Path) -> bool:
+        """Memory-map cached reference embeddings; returns False on a miss."""
+        try:
+            with open(cache_path.with_suffix(".json"), "r", encoding="utf-8") as f:
+                tag_paths = json.load(f)
+            embeddings = np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+
+        if embeddings.shape[0] != len(tag_paths):
+            return False
+
+        self.tag_paths = tag_paths
+        self.reference_embeddings = embeddings
+        logger.info(f"Loaded {len(tag_paths)} reference embeddings from {cache_path}")
+        return True
+
+    def _save_reference_embeddings(self, cache_path: Path):
+        """Write reference embeddings and tag paths to the cache atomically."""
+        suffix = f".{uuid.uuid4().hex}.tmp"
+        npy_tmp = cache_path.with_suffix(suffix)
+        json_tmp = cache_path.with_suffix(".json" + suffix)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(json_tmp, "w", encoding="utf-8") as f:
+                json.dump(self.tag_paths, f)
+            with open(npy_tmp, "wb") as f:
+                np.save(f, self.reference_embeddings)
+            # Paths first: a reader only trusts the .npy once its .json exists
+            os.replace(json_tmp, cache_path.with_suffix(".json"))
+            os.replace(npy_tmp, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache reference embeddings at {cache_path}: {e}")
+            json_tmp.unlink(missing_ok=True)
+            npy_tmp.unlink(missing_ok=True)
+
     def tag(self, title: str, description: str = "") -> List[SemanticTag]:
         """
         Apply embedding-based semantic tags to FOA text.
@@ -98,39 +272,158 @@ class EmbeddingTagger:
         Returns:
             List of SemanticTag objects sorted by confidence.
         """
-        self._lazy_init()
+        tags = self.tag_batch([(title, description)])[0]
 
-        combined_text = f"{title}. {description}" if description else title
+        logger.debug(
+            f"Embedding tagger found {len(tags)} tags "
+            f"(threshold={self.threshold}) for: {title[:60]}"
+        )
+        return tags
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into L2-normalized embeddings.
+
+        Args:
+            texts: Texts to encode.
+
+        Returns:
+            Array of shape (len(texts), embedding_dim).
+        """
+        self._lazy_init()
+        if self._batcher is not None:
+            return self._batcher.encode(texts)
+        return self._encode_direct(texts)
 
-        # Encode the query text
-        query_embedding = self.model.encode(
-            [combined_text],
+    def _encode_direct(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=EMBEDDING_BATCH_SIZE,
             show_progress_bar=False,
             normalize_embeddings=True,
+            convert_to_numpy=True,
         )
 
-        # Compute cosine similarity with all reference tags
-        similarities = self._cosine_similarity(
-            query_embedding, self.reference_embeddings
-        )[0]
-
-        # Filter by threshold and create SemanticTag objects
-        tags = []
-        for i, sim in enumerate(similarities):
-            if sim >= self.threshold:
-                tags.append(
-                    SemanticTag(
-                        tag=self.tag_paths[i],
-                        confidence=float(round(sim, 4)),
-                        method="embedding",
-                    )
-                )
-
-        # Sort by confidence descending
-        tags.sort(key=lambda t: t.confidence, reverse=True)
+    def _search_exact(
+        self, query_embeddings: np.ndarray, top_k: Optional[int]
+    ) -> List[List[SemanticTag]]:
+        """Score every reference tag with one matmul and threshold the result."""
+        similarity_matrix = self._similarities(query_embeddings)
+
+        mask = similarity_matrix >= self.threshold
+
+        num_tags = similarity_matrix.shape[1]
+        if top_k is not None and top_k < num_tags:
+            # Keep only the top-k candidates per row without a full sort.
+            # Ties at the k-th score go to the lower tag index, as in the
+            # rule-based tagger, so the kept set doesn't vary between runs.
+            cutoff = -np.partition(
+                -similarity_matrix, top_k - 1, axis=1
+            )[:, top_k - 1:top_k]
+            above = similarity_matrix > cutoff
+            at_cutoff = similarity_matrix == cutoff
+            slots_left = top_k - above.sum(axis=1, keepdims=True)
+            mask &= above | (at_cutoff & (np.cumsum(at_cutoff, axis=1) <= slots_left))
+
+        results = []
+        for similarities, row_mask in zip(similarity_matrix, mask):
+            indices = np.flatnonzero(row_mask)
+            results.append(self._make_tags(indices, similarities[indices]))
+        return results
+
+    def _search_ann(
+        self, query_embeddings: np.ndarray, top_k: Optional[int]
+    ) -> List[List[SemanticTag]]:
+        """Retrieve approximate nearest reference tags from the HNSW index."""
+        k = min(top_k or EMBEDDING_ANN_K, len(self.tag_paths))
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        scores, neighbours = self._ann_index.search(queries, k)
+
+        results = []
+        for row_scores, row_neighbours in zip(scores, neighbours):
+            # FAISS pads missing neighbours with index -1
+            keep = (row_neighbours >= 0) & (row_scores >= self.threshold)
+            # Index order first, so ties rank the same as in exact search
+            by_index = np.argsort(row_neighbours[keep])
+            results.append(self._make_tags(
+                row_neighbours[keep][by_index], row_scores[keep][by_index]
+            ))
+        return results
+
+    def _make_tags(
+        self, indices: np.ndarray, similarities: np.ndarray
+    ) -> List[SemanticTag]:
+        """Build SemanticTags for matched reference tags, best first."""
+        # Round, clip and order in NumPy; Python only builds the tags
+        confidences = np.minimum(np.round(similarities, 4), 1.0)
+        order = np.argsort(-confidences, kind="stable")
+        return [
+            SemanticTag(
+                tag=self.tag_paths[i],
+                confidence=confidence,
+                method="embedding",
+            )
+            for i, confidence in zip(
+                indices[order].tolist(), confidences[order].tolist()
+            )
+        ]
+
+    def _similarities(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """Return the (num_queries, num_tags) cosine similarity matrix."""
+        # Match the reference dtype so NumPy doesn't upcast (and copy) the
+        # whole reference matrix on every call
+        query = np.asarray(query_embeddings, dtype=self.reference_embeddings.dtype)
+        return (query @ self.reference_embeddings.T).astype(np.float32, copy=False)
+
+    def enable_micro_batching(self):
+        """
+        Route encode() calls through a shared MicroBatcher, so concurrent
+        callers (e.g. API requests) are encoded together in one batch.
+        """
+        if self._batcher is None:
+            self._batcher = MicroBatcher(self._encode_direct)
+
+    def tag_batch(
+        self,
+        items: List[Tuple[str, str]],
+        top_k: Optional[int] = None,
+    ) -> List[List[SemanticTag]]:
+        """
+        Apply embedding-based semantic tags to many FOAs at once.
+
+        All texts are encoded in a single batched call (sentence-transformers
+        groups inputs by length internally to minimize padding), and
+        similarities against the reference tags are computed with one
+        matrix multiplication of the L2-normalized embeddings (or, for
+        ontologies above EMBEDDING_ANN_MIN_TAGS, an HNSW index search).
+
+        Args:
+            items: List of (title, description) pairs.
+            top_k: If given, keep at most this many tags per item.
+
+        Returns:
+            One list of SemanticTag objects per item, sorted by confidence.
+        """
+        if not items:
+            return []
+        if top_k is not None and top_k <= 0:
+            # As in the rule-based tagger; also keeps k >= 1 for the searches
+            return [[] for _ in items]
+
+        texts = [
+            f"{title}. {description}" if description else title
+            for title, description in items
+        ]
+
+        query_embeddings = self.encode(texts)
+
+        if self._ann_index is not None:
+            results = self._search_ann(query_embeddings, top_k)
+        else:
+            results = self._search_exact(query_embeddings, top_k)
 
         logger.debug(
-            f"Embedding tagger found {len(tags)} tags "
-            f"(threshold={self.threshold}) for: {title[:60]}"
+            f"Embedding tagger tagged {len(items)} items in one batch "
+            f"(threshold={self.threshold})"
         )
-        return tags
+        return results
@@ -6,6 +6,7 @@ tags, synonyms, and hierarchical relationships.
 """
 
 import logging
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -13,29 +14,40 @@ import yaml
 
 from config.settings import ONTOLOGY_PATH
 
+# Prefer the libyaml-backed C loader (bundled with PyYAML wheels)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
 class OntologyTag:
     """Represents a single tag in the ontology."""
 
+    __slots__ = (
+        "category", "name", "synonyms", "children", "full_path", "all_terms", "all_terms_lower"
+    )
+
     def __init__(self, category: str, name: str, synonyms: List[str] = None, children: List[str] = None):
         self.category = category          # e.g., "research_domains"
         self.name = name                  # e.g., "artificial_intelligence"
         self.synonyms = synonyms or []    # e.g., ["AI", "machine learning"]
         self.children = children or []    # e.g., ["nlp", "computer_vision"]
 
-    @property
-    def full_path(self) -> str:
-        """Returns category/name path (e.g., 'research_domains/artificial_intelligence')."""
-        return f"{self.category}/{self.name}"
-
-    @property
-    def all_terms(self) -> List[str]:
-        """Returns name + all synonyms for matching."""
-        terms = [self.name.replace("_", " ")]
-        terms.extend(self.synonyms)
-        return terms
+        # Derived once here; read on every tagging call. Interned, since
+        # every tag result and matched-term set refers to these strings
+        self.full_path = sys.intern(f"{category}/{name}")  # e.g., "research_domains/artificial_intelligence"
+        self.all_terms = [  # name + synonyms for matching
+            sys.intern(term) if isinstance(term, str) else term
+            for term in (name.replace("_", " "), *self.synonyms)
+        ]
+        # Lowercased once for case-insensitive matching against lowercased text
+        self.all_terms_lower = [
+            sys.intern(term.lower()) if isinstance(term, str) else term
+            for term in self.all_terms
+        ]
 
     def __repr__(self):
         return f"OntologyTag({self.full_path})"
@@ -48,6 +60,8 @@ class Ontology:
         self.path = path or ONTOLOGY_PATH
         self.tags: List[OntologyTag] = []
         self.categories: Dict[str, List[OntologyTag]] = {}
+        self._name_to_idx: Dict[str, int] = {}
+        self.all_terms_joined: List[str] = []  # " ".join(tag.all_terms), per tag
         self._load()
 
     def _load(self):
@@ -55,10 +69,17 @@ class Ontology:
         logger.info(f"Loading ontology from {self.path}")
 
         with open(self.path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
+
+        # Pre-size the tag lists; trimmed below if any entries are skipped
+        total = sum(len(tag_list) for tag_list in data.values())
+        self.tags = [None] * total
+        self.all_terms_joined = [None] * total
+        count = 0
 
         for category, tag_list in data.items():
-            self.categories[category] = []
+            category_tags = [None] * len(tag_list)
+            category_count = 0
 
             for tag_entry in tag_list:
                 if isinstance(tag_entry, dict):
@@ -78,8 +99,19 @@ class Ontology:
                     synonyms=synonyms,
                     children=children,
                 )
-                self.tags.append(tag)
-                self.categories[category].append(tag)
+                # First tag wins on duplicate names, as with the old linear scan
+                self._name_to_idx.setdefault(name.lower(), count)
+                self.tags[count] = tag
+                self.all_terms_joined[count] = " ".join(tag.all_terms)
+                count += 1
+                category_tags[category_count] = tag
+                category_count += 1
+
+            del category_tags[category_count:]
+            self.categories[category] = category_tags
+
+        del self.tags[count:]
+        del self.all_terms_joined[count:]
 
         logger.info(
             f"Loaded {len(self.tags)} tags across "
@@ -96,8 +128,5 @@ class Ontology:
 
     def get_tag_by_name(self, name: str) -> Optional[OntologyTag]:
         """Find a tag by name (case-insensitive)."""
-        name_lower = name.lower()
-        for tag in self.tags:
-            if tag.name.lower() == name_lower:
-                return tag
-        return None
+        idx = self._name_to_idx.get(name.lower())
+        return self.tags[idx] if idx is not None else None
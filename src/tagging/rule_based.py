@@ -6,14 +6,88 @@ keyword matches against the controlled ontology.
 """
 
 import re
+import hashlib
 import logging
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from src.cache.ttl_cache import TTLCache
 from src.extraction.schema import SemanticTag
 from src.tagging.ontology import Ontology, OntologyTag
+from config.settings import RULE_TAG_CACHE_MAXSIZE
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
+_WORD_TERM_RE = re.compile(r"\w+")
+
+
+def _is_word_char(char: str) -> bool:
+    # Same character class as \w in a str regex
+    return char.isalnum() or char == "_"
+
+
+def _compile_word_boundary(*terms: str) -> re.Pattern:
+    """Compile a word-bounded alternation of literal terms."""
+    # Both terms and text are lowercased, so no IGNORECASE is needed
+    return re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+
+
+class _TagMatcher:
+    """Precompiled matching data for one ontology tag."""
+
+    __slots__ = (
+        "tag",
+        "num_terms",
+        "short_pattern",
+        "short_counts",
+        "checked_terms",
+    )
+
+    def __init__(self, ontology_tag: OntologyTag):
+        self.tag = ontology_tag
+        self.num_terms = len(ontology_tag.all_terms)
+
+        terms = ontology_tag.all_terms_lower
+
+        # Short terms made only of word characters each match a whole word,
+        # so two of them can never overlap and one alternation finds every
+        # distinct match in a single scan. Counts keep duplicate terms
+        # weighted as before.
+        word_terms = [
+            term for term in terms if len(term) <= 3 and _WORD_TERM_RE.fullmatch(term)
+        ]
+        self.short_counts: Dict[str, int] = {}
+        for term in word_terms:
+            self.short_counts[term] = self.short_counts.get(term, 0) + 1
+
+        # Every other term is checked on its own: long terms by substring,
+        # then the remaining short terms with a word-boundary check.
+        long_terms = [term for term in terms if len(term) > 3]
+        other_short_terms = [
+            term for term in terms
+            if len(term) <= 3 and not _WORD_TERM_RE.fullmatch(term)
+        ]
+        self.checked_terms = long_terms + other_short_terms
+
+        self.short_pattern = None
+        if self.short_counts:
+            # Longest first, so the longest alternative wins at a position
+            self.short_pattern = _compile_word_boundary(
+                *sorted(self.short_counts, key=len, reverse=True)
+            )
+
 
 class RuleBasedTagger:
     """
@@ -31,78 +105,374 @@ class RuleBasedTagger:
 
     def __init__(self, ontology: Optional[Ontology] = None):
         self.ontology = ontology or Ontology()
+
+        # Per-tag matching data, precompiled once up front
+        self._matchers = [
+            _TagMatcher(ontology_tag)
+            for ontology_tag in self.ontology.get_all_tags()
+        ]
+        # Normalizer per tag: max possible score per term * num terms
+        self._max_possible = [
+            (self.TITLE_WEIGHT + 1.0) * matcher.num_terms for matcher in self._matchers
+        ]
+
+        # With hyperscan or pyahocorasick installed, every term of every
+        # tag is matched in one pass over each text instead of one scan
+        # per tag
+        self._automaton = None
+        self._hyperscan_db = None
+        self._hyperscan_terms: List[str] = []
+        self._hyperscan_local = threading.local()
+        self._term_tags: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+        # (char before a space, char after it) -> terms with that space;
+        # "" stands for the start/end of the term
+        self._join_candidates: Dict[Tuple[str, str], List[str]] = {}
+        self._unindexed_terms: List[Tuple[int, str]] = []
+        if hyperscan is not None or ahocorasick is not None:
+            self._build_term_index()
+
+        # Results for recently tagged texts (reruns, duplicate hits)
+        self._cache = TTLCache(maxsize=RULE_TAG_CACHE_MAXSIZE, ttl=None)
+
         logger.info(
             f"RuleBasedTagger initialized with {len(self.ontology.tags)} tags"
         )
 
-    def tag(self, title: str, description: str = "") -> List[SemanticTag]:
+    def tag(
+        self, title: str, description: str = "", top_k: Optional[int] = None
+    ) -> List[SemanticTag]:
         """
         Apply rule-based semantic tags to FOA text.
 
+        Terms are matched against the title and the description
+        separately; a term counts for the full text if it appears in
+        either, or across the space that would join them.
+
         Args:
             title: FOA title text.
             description: FOA description/abstract text.
+            top_k: If given, keep at most this many tags.
 
         Returns:
             List of SemanticTag objects with confidence scores.
         """
-        tags = []
-        combined_text = f"{title} {description}".lower()
-        title_lower = title.lower()
+        key = self._cache_key(title, description, top_k)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        title_lower, description_lower = self._prepare(title, description)
+
+        title_counts, text_counts = self._match_counts(title_lower, description_lower)
+        tags = self._build_tags(self._confidences(title_counts, text_counts), top_k)
+
+        logger.debug(f"Rule-based tagger found {len(tags)} tags for: {title_lower[:60]}")
+        self._cache.set(key, tags)
+        return list(tags)
+
+    @staticmethod
+    def _cache_key(title: str, description: str, top_k: Optional[int]) -> tuple:
+        """
+        Result cache key: a fixed-size digest of the raw text, so cached
+        entries don't keep whole titles and abstracts alive.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for text in (title, str(description)):
+            data = text.encode("utf-8", "surrogatepass")
+            # Length prefixes keep ("ab", "c") and ("a", "bc") apart
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.digest(), top_k
+
+    @staticmethod
+    def _prepare(title: str, description: str) -> Tuple[str, str]:
+        """Lowercase FOA text for matching: (title_lower, description_lower)."""
+        return title.lower(), str(description).lower()
+
+    def _confidences(
+        self, title_counts: List[int], text_counts: List[int]
+    ) -> List[float]:
+        """Confidence per tag from per-tag hit counts; title matches weigh more."""
+        # A plain loop beats building arrays for a few dozen tags
+        title_weight = self.TITLE_WEIGHT
+        return [
+            (title_weight * title_hits + text_hits) / max_possible if max_possible > 0 else 0.0
+            for title_hits, text_hits, max_possible in zip(
+                title_counts, text_counts, self._max_possible
+            )
+        ]
 
-        for ontology_tag in self.ontology.get_all_tags():
-            confidence = self._compute_confidence(
-                ontology_tag, title_lower, combined_text
+    def _build_tags(
+        self, confidences: List[float], top_k: Optional[int] = None
+    ) -> List[SemanticTag]:
+        """SemanticTags for the (top_k) tags clearing MIN_CONFIDENCE, highest first."""
+        matched = [
+            (i, min(confidence, 1.0))
+            for i, confidence in enumerate(confidences)
+            if confidence >= self.MIN_CONFIDENCE
+        ]
+
+        if top_k is not None and top_k < len(matched):
+            keep = self._top_k_positions(
+                np.array([confidence for _, confidence in matched]), max(top_k, 0)
+            )
+            matched = [matched[pos] for pos in keep.tolist()]
+
+        # Confidence descending; the sort is stable, so ties keep ontology order
+        matched.sort(key=lambda item: item[1], reverse=True)
+        return [
+            SemanticTag(
+                tag=self._matchers[i].tag.full_path,
+                confidence=confidence,
+                method="rule_based",
             )
+            for i, confidence in matched
+        ]
+
+    @staticmethod
+    def _top_k_positions(values: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the k largest values, in ascending order, breaking
+        ties at the cutoff in favour of earlier positions (as a stable
+        full sort would).
+        """
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        cutoff = values[np.argpartition(-values, k - 1)[k - 1]]
+        above = np.flatnonzero(values > cutoff)
+        at_cutoff = np.flatnonzero(values == cutoff)[: k - len(above)]
+        return np.sort(np.concatenate((above, at_cutoff)))
 
-            if confidence >= self.MIN_CONFIDENCE:
-                tags.append(
-                    SemanticTag(
-                        tag=ontology_tag.full_path,
-                        confidence=min(confidence, 1.0),
-                        method="rule_based",
-                    )
+    def _build_term_index(self):
+        """Index every ontology term for single-pass matching."""
+        # term -> {tag index: number of times the tag lists the term}
+        term_tags: Dict[str, Dict[int, int]] = {}
+        for idx, matcher in enumerate(self._matchers):
+            for term in matcher.tag.all_terms_lower:
+                tag_counts = term_tags.setdefault(term, {})
+                tag_counts[idx] = tag_counts.get(idx, 0) + 1
+
+        for term, tag_counts in term_tags.items():
+            if not term:
+                # Neither index can hold an empty word
+                self._unindexed_terms.extend(
+                    (idx, term) for idx, n in tag_counts.items() for _ in range(n)
                 )
+                continue
+            self._term_tags[term] = tuple(tag_counts.items())
+            join_keys = {
+                (term[k - 1] if k else "", term[k + 1:k + 2])
+                for k, char in enumerate(term) if char == " "
+            }
+            for join_key in join_keys:
+                self._join_candidates.setdefault(join_key, []).append(term)
+
+        if hyperscan is not None:
+            self._build_hyperscan_db()
+        if ahocorasick is not None and self._term_tags:
+            automaton = ahocorasick.Automaton()
+            for term in self._term_tags:
+                automaton.add_word(term, (term, len(term) <= 3))
+            automaton.make_automaton()
+            self._automaton = automaton
 
-        # Sort by confidence descending
-        tags.sort(key=lambda t: t.confidence, reverse=True)
+    def _build_hyperscan_db(self):
+        """Compile the ASCII terms into one Hyperscan block-mode database."""
+        # Hyperscan's \b only knows ASCII word characters, so the database
+        # is used for ASCII text only, where it agrees with Python's \b.
+        # A non-ASCII term can never occur in ASCII text.
+        terms = [term for term in self._term_tags if term.isascii()]
+        if not terms:
+            return
+        expressions = [
+            (r"\b" + re.escape(term) + r"\b" if len(term) <= 3 else re.escape(term)).encode()
+            for term in terms
+        ]
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        try:
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(terms))),
+                flags=hyperscan.HS_FLAG_SINGLEMATCH,
+            )
+        except hyperscan.HyperscanError as e:
+            logger.warning(f"Could not compile Hyperscan database, not using it: {e}")
+            return
+        self._hyperscan_db = db
+        self._hyperscan_terms = terms
+
+    def _match_counts(
+        self, title_lower: str, description_lower: str
+    ) -> Tuple[List[int], List[int]]:
+        """Per tag, count its terms found in the title and in the full text."""
+        if self._automaton is None and self._hyperscan_db is None:
+            # Tag by tag over the title and the joined full text
+            text_lower = f"{title_lower} {description_lower}"
+
+            title_counts = []
+            text_counts = []
+            for matcher in self._matchers:
+                title_hits, text_hits = self._tag_hits(matcher, title_lower, text_lower)
+                title_counts.append(title_hits)
+                text_counts.append(text_hits)
+            return title_counts, text_counts
 
-        logger.debug(f"Rule-based tagger found {len(tags)} tags for: {title[:60]}")
-        return tags
+        return self._indexed_counts(
+            title_lower,
+            description_lower,
+            self._indexed_matches(title_lower),
+            self._indexed_matches(description_lower),
+        )
 
-    def _compute_confidence(
+    def _indexed_counts(
         self,
-        ontology_tag: OntologyTag,
         title_lower: str,
-        combined_text: str,
-    ) -> float:
-        """
-        Compute confidence score for a tag against the text.
+        description_lower: str,
+        title_terms: set,
+        description_terms: set,
+    ) -> Tuple[List[int], List[int]]:
+        """Per tag counts from the indexed terms found in title and description."""
+        text_terms = title_terms | description_terms
+        # Only terms with a space between the title's last character and
+        # the description's first can straddle the join
+        title_end, description_start = title_lower[-1:], description_lower[:1]
+        candidates = set()
+        for join_key in {
+            (title_end, description_start), ("", description_start),
+            (title_end, ""), ("", ""),
+        }:
+            candidates.update(self._join_candidates.get(join_key, ()))
+        text_terms.update(
+            term for term in candidates
+            if term not in text_terms
+            and self._spans_join(term, title_lower, description_lower)
+        )
 
-        Uses term frequency with title boost.
-        """
-        terms = ontology_tag.all_terms
-        if not terms:
-            return 0.0
+        title_counts = self._tag_counts(title_terms)
+        text_counts = self._tag_counts(text_terms)
+        for idx, term in self._unindexed_terms:
+            in_title = self._term_in_text(term, title_lower)
+            title_counts[idx] += in_title
+            text_counts[idx] += in_title or self._term_in_text(term, description_lower)
+        return title_counts, text_counts
+
+    def _indexed_matches(self, text: str) -> set:
+        """Distinct indexed terms found in text, by the fastest index available."""
+        if not text:
+            # E.g. an FOA without a description; no indexed term is empty
+            return set()
+        if self._hyperscan_db is not None and text.isascii():
+            return self._hyperscan_matches(text)
+        if self._automaton is not None:
+            return self._automaton_matches(text)
+        return {term for term in self._term_tags if self._term_in_text(term, text)}
+
+    def _hyperscan_scratch(self) -> "hyperscan.Scratch":
+        """This thread's scratch space (it can't be shared between concurrent scans)."""
+        scratch = getattr(self._hyperscan_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(self._hyperscan_db)
+        return scratch
+
+    def _hyperscan_matches(self, text: str) -> set:
+        """Distinct indexed terms found in ASCII text, in one Hyperscan scan."""
+        terms = self._hyperscan_terms
+        matched = set()
 
-        total_score = 0.0
+        def on_match(term_id, start, end, flags, context):
+            matched.add(terms[term_id])
 
+        self._hyperscan_db.scan(
+            text.encode("ascii"),
+            match_event_handler=on_match,
+            scratch=self._hyperscan_scratch(),
+        )
+        return matched
+
+    def _automaton_matches(self, text: str) -> set:
+        """Distinct indexed terms found in text."""
+        matched = set()
+        for end, (term, needs_boundary) in self._automaton.iter(text):
+            if term in matched:
+                continue
+            if needs_boundary and not self._at_word_boundaries(
+                text, end - len(term) + 1, end
+            ):
+                continue
+            matched.add(term)
+        return matched
+
+    def _tag_counts(self, terms: set) -> List[int]:
+        """Per tag, how many of its terms are in terms."""
+        counts = [0] * len(self._matchers)
         for term in terms:
-            term_lower = term.lower()
+            for idx, n in self._term_tags[term]:
+                counts[idx] += n
+        return counts
 
-            # Check title match (higher weight)
-            if self._term_in_text(term_lower, title_lower):
-                total_score += self.TITLE_WEIGHT
+    def _spans_join(self, term: str, title_lower: str, description_lower: str) -> bool:
+        """
+        Whether term occurs across the space joining title and description,
+        i.e. in "title description" but straddling the separator.
+        """
+        for k, char in enumerate(term):
+            if char != " ":
+                continue
+            head, tail = term[:k], term[k + 1:]
+            if not (title_lower.endswith(head) and description_lower.startswith(tail)):
+                continue
+            if len(term) > 3:
+                return True
+            # Short terms also need word boundaries in the joined text
+            start = len(title_lower) - k
+            before = start > 0 and _is_word_char(title_lower[start - 1])
+            after = len(tail) < len(description_lower) and _is_word_char(
+                description_lower[len(tail)]
+            )
+            if before != _is_word_char(term[0]) and after != _is_word_char(term[-1]):
+                return True
+        return False
+
+    @staticmethod
+    def _at_word_boundaries(text: str, start: int, end: int) -> bool:
+        """Whether text[start:end + 1] is delimited like \b...\b."""
+        before = start > 0 and _is_word_char(text[start - 1])
+        after = end + 1 < len(text) and _is_word_char(text[end + 1])
+        return (
+            before != _is_word_char(text[start])
+            and after != _is_word_char(text[end])
+        )
+
+    def _tag_hits(
+        self, matcher: _TagMatcher, title_lower: str, text_lower: str
+    ) -> Tuple[int, int]:
+        """
+        Count the tag's terms found in the title and in the full text
+        (each at most once), term by term.
+        """
+        title_hits = text_hits = 0
 
-            # Check description match
-            if self._term_in_text(term_lower, combined_text):
-                total_score += 1.0
+        if matcher.short_pattern is not None:
+            title_terms = set(matcher.short_pattern.findall(title_lower))
+            text_terms = set(matcher.short_pattern.findall(text_lower))
+            for term in title_terms:
+                title_hits += matcher.short_counts[term]
+            for term in text_terms:
+                text_hits += matcher.short_counts[term]
 
-        # Normalize: score / (max possible score per term * num terms)
-        max_possible = (self.TITLE_WEIGHT + 1.0) * len(terms)
-        confidence = total_score / max_possible if max_possible > 0 else 0.0
+        for term in matcher.checked_terms:
+            # A title match is also a full-text match; long terms need no
+            # word boundaries, so a plain substring test will do
+            if len(term) > 3:
+                in_title = term in title_lower
+                in_text = in_title or term in text_lower
+            else:
+                in_title = self._term_in_text(term, title_lower)
+                in_text = in_title or self._term_in_text(term, text_lower)
+            title_hits += in_title
+            text_hits += in_text
 
-        return confidence
+        return title_hits, text_hits
 
     def _term_in_text(self, term: str, text: str) -> bool:
         """
@@ -113,7 +483,17 @@ class RuleBasedTagger:
         """
         # For single-character or very short terms, require word boundaries
         if len(term) <= 3:
-            pattern = rf"\b{re.escape(term)}\b"
-            return bool(re.search(pattern, text, re.IGNORECASE))
+            if not term:
+                # \b\b matches wherever the text has a word character
+                return any(_is_word_char(char) for char in text)
+            # Plain find() plus a look at the neighbouring characters,
+            # with the same semantics as \bterm\b but no regex engine
+            last = len(term) - 1
+            idx = text.find(term)
+            while idx != -1:
+                if self._at_word_boundaries(text, idx, idx + last):
+                    return True
+                idx = text.find(term, idx + 1)
+            return False
         else:
             return term in text
@@ -0,0 +1,87 @@
+"""
+Tests for the rule-based tagger's matching backends.
+
+Hyperscan, pyahocorasick and the per-tag fallback must produce
+identical tags for the same text.
+"""
+
+import random
+
+import pytest
+
+from src.tagging import rule_based
+from src.tagging.ontology import Ontology
+
+FILLER = [
+    "the", "of", "and", "a", "data-driven", "é", "ü", "xai", "ai.", "ml,",
+    "k-12", "(stem)", "_ai", "ai_", "3d", "naïve", "",
+]
+
+
+def _make_tagger(monkeypatch, ontology, backend):
+    """A tagger built with only the given matching backend available."""
+    if backend != "hyperscan":
+        monkeypatch.setattr(rule_based, "hyperscan", None)
+    if backend == "fallback":
+        monkeypatch.setattr(rule_based, "ahocorasick", None)
+    tagger = rule_based.RuleBasedTagger(ontology)
+    monkeypatch.undo()
+    return tagger
+
+
+def _sample_texts(ontology, n=500, seed=0):
+    """(title, description) pairs mixing ontology terms with tricky filler."""
+    rng = random.Random(seed)
+    terms = [term for tag in ontology.get_all_tags() for term in tag.all_terms]
+
+    def text(max_words):
+        words = [
+            rng.choice(terms) if rng.random() < 0.6 else rng.choice(FILLER)
+            for _ in range(rng.randint(0, max_words))
+        ]
+        return " ".join(words)
+
+    texts = []
+    for _ in range(n):
+        title = text(6)
+        title = rng.choice([title, title.upper(), title.title()])
+        texts.append((title, text(30)))
+    return texts
+
+
+@pytest.fixture(scope="module")
+def ontology():
+    return Ontology()
+
+
+@pytest.mark.parametrize("backend", ["ahocorasick", "hyperscan"])
+def test_backends_match_fallback(monkeypatch, ontology, backend):
+    pytest.importorskip(backend)
+    fallback = _make_tagger(monkeypatch, ontology, "fallback")
+    indexed = _make_tagger(monkeypatch, ontology, backend)
+    if backend == "hyperscan":
+        assert indexed._hyperscan_db is not None
+    else:
+        assert indexed._automaton is not None and indexed._hyperscan_db is None
+
+    for title, description in _sample_texts(ontology):
+        assert indexed.tag(title, description) == fallback.tag(title, description), (
+            title, description,
+        )
+
+
+def test_term_spanning_title_and_description(monkeypatch, ontology):
+    # A multi-word term split across the title/description join counts for
+    # the full text just as if it were all in the description
+    for backend in ("fallback", "ahocorasick", "hyperscan"):
+        if backend != "fallback":
+            pytest.importorskip(backend)
+        tagger = _make_tagger(monkeypatch, ontology, backend)
+        for tag in ontology.get_all_tags():
+            for term in tag.all_terms_lower:
+                if " " not in term:
+                    continue
+                head, tail = term.split(" ", 1)
+                _, spanned = tagger._match_counts(head, tail)
+                _, joined = tagger._match_counts("", term)
+                assert spanned == joined, (backend, term)